@@ -1,14 +1,45 @@
+import orjson
 from flask import Flask
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, which serializes large summaries and search results faster"""
+    
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        # Flask asks for indented output when pretty-printing responses in debug mode
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=kwargs.get("default", self.default), option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 def create_app():
     app = Flask(__name__, static_folder="../static")
+    app.json = OrjsonProvider(app)
     
     # Enable CORS for all routes to allow React app to connect
     CORS(app)
     
     # Load configuration
-    app.config.from_pyfile("../config/settings.py", silent=True)
+    app.config.from_pyfile("../config/setting.py", silent=True)
+    
+    # Create the summarizer once at startup so its LLM client is shared by all requests
+    from app.core.summarizer import get_summarizer
+    app.extensions['summarizer'] = get_summarizer(
+        app.config.get("LLAMA_MODEL", "llama-3.1-8b-instant"),
+        max_concurrency=app.config.get("SUMMARIZER_MAX_CONCURRENCY", 4),
+        cache_redis_url=app.config.get("CACHE_REDIS_URL"),
+        cache_maxsize=app.config.get("LLM_CACHE_MAXSIZE", 1024),
+        cache_ttl=app.config.get("SUMMARY_CACHE_TTL", 86_400),
+        combine_model_name=app.config.get("LLAMA_COMBINE_MODEL")
+    )
     
     # Import routes - this applies them directly to the app
     from app.api.routes import register_routes
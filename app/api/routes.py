@@ -1,29 +1,133 @@
-from flask import request, jsonify, current_app
+import re
+import orjson
+from urllib.parse import urlparse
+from flask import Response, request, jsonify, current_app
 from app.core.extractors.arxiv import ArxivExtractor
 from app.core.extractors.hal import HalExtractor
-from app.core.summarizer import LlamaSummarizer
+from app.utils.cache import create_cache
 
 
-# Initialize the summarizer
-summarizer = None
+# Upper bound on the number of URLs accepted by /api/summarize_batch
+MAX_BATCH_SIZE = 20
 
-def get_summarizer():
-    global summarizer
-    if summarizer is None:
-        model = current_app.config.get("LLAMA_MODEL", "meta-llama/llama-4-scout-17b-16e-instruct")
-        summarizer = LlamaSummarizer(model_name=model)
-    return summarizer
+_ARXIV_VERSION_RE = re.compile(r'v\d+$')
+
+# Article extractors by URL hostname
+_EXTRACTORS = {
+    'arxiv.org': ArxivExtractor.extract_from_url,
+    'www.arxiv.org': ArxivExtractor.extract_from_url,
+    'export.arxiv.org': ArxivExtractor.extract_from_url,
+    'hal.science': HalExtractor.extract_from_url,
+    'hal.archives-ouvertes.fr': HalExtractor.extract_from_url,
+}
+
+def current_summarizer():
+    """Return the summarizer created once in create_app"""
+    return current_app.extensions['summarizer']
+
+def current_summary_cache():
+    """Return the summary cache created in register_routes (keys from summary_cache_key)"""
+    return current_app.extensions['summary_cache']
+
+def article_info(article_data, article_url):
+    """Article fields returned alongside a summary"""
+    return {
+        'id': article_data.get('id'),
+        'title': article_data.get('title'),
+        'authors': article_data.get('authors', []),
+        'source': article_data.get('source'),
+        'url': article_url
+    }
+
+def sse_event(event, data):
+    """Format a Server-Sent Events message with a JSON payload"""
+    # orjson directly rather than app.json: the stream is generated outside the app context
+    return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
+
+def summary_cache_key(article_data):
+    """Cache key for an extracted article, e.g. 'arxiv:2303.08774v6'"""
+    return f"{article_data.get('source')}:{article_data.get('id')}"
+
+def summarize_cached(article_summarizer, article_data):
+    """Summarize an article, reusing a previous result for the same article if cached"""
+    summary_cache = current_summary_cache()
+    key = summary_cache_key(article_data)
+    summary_result = summary_cache.get(key)
+    if summary_result is None:
+        summary_result = article_summarizer.summarize(article_data)
+        # Don't cache failures so the next request retries the LLM
+        if not summary_result.get('summary', '').startswith('Error:'):
+            summary_cache.set(key, summary_result)
+    return summary_result
+
+def get_extractor(url):
+    """Return the extract_from_url function matching the URL's host, or None if unsupported"""
+    # Accept bare "arxiv.org/abs/..." URLs as well
+    parsed = urlparse(url if '//' in url else f'//{url}')
+    extractor = _EXTRACTORS.get(parsed.hostname or '')
+    # HAL documents are also served from institutional portals (e.g. hal.inria.fr)
+    if extractor is None and 'hal-' in parsed.path:
+        extractor = HalExtractor.extract_from_url
+    return extractor
 
 def extract_article(url):
     """Extract article based on URL"""
-    if 'arxiv.org' in url:
-        return ArxivExtractor.extract_from_url(url)
-    elif 'hal.archives-ouvertes.fr' in url or 'hal-' in url:
-        return HalExtractor.extract_from_url(url)
-    else:
+    extractor = get_extractor(url)
+    if extractor is None:
         raise ValueError(f"Unsupported URL format: {url}")
+    return extractor(url)
+
+def _strip_arxiv_version(article_id):
+    """Drop a trailing version suffix (e.g. 'v2') so requested and canonical IDs compare equal"""
+    return _ARXIV_VERSION_RE.sub('', article_id)
+
+def extract_articles(urls):
+    """
+    Extract several articles, fetching all ArXiv ones in a single API call.
+
+    Returns a list aligned with urls where each item is either the article
+    data or the exception raised while extracting it.
+    """
+    results = [None] * len(urls)
+    arxiv_ids = {}
+
+    for i, url in enumerate(urls):
+        try:
+            if get_extractor(url) is ArxivExtractor.extract_from_url:
+                article_id = ArxivExtractor.parse_id(url)
+                # A malformed ID makes the API answer with a single error entry for the whole batch
+                if not ArxivExtractor.is_valid_id(article_id):
+                    raise ValueError(f"Invalid ArXiv ID format: {article_id}")
+                arxiv_ids[i] = article_id
+            else:
+                results[i] = extract_article(url)
+        except Exception as e:
+            results[i] = e
+
+    if arxiv_ids:
+        try:
+            articles = ArxivExtractor.extract_by_ids(list(arxiv_ids.values()))
+            by_id = {_strip_arxiv_version(article['id']): article for article in articles}
+            for i, article_id in arxiv_ids.items():
+                article = by_id.get(_strip_arxiv_version(article_id))
+                results[i] = article or ValueError(f"Article with ID {article_id} not found")
+        except Exception:
+            # Retry one by one so only the failing articles report an error
+            for i, article_id in arxiv_ids.items():
+                try:
+                    results[i] = ArxivExtractor.extract_by_id(article_id)
+                except Exception as e:
+                    results[i] = e
+
+    return results
 
 def register_routes(app):
+    app.extensions['summary_cache'] = create_cache(
+        redis_url=app.config.get("CACHE_REDIS_URL"),
+        maxsize=app.config.get("SUMMARY_CACHE_MAXSIZE", 10_000),
+        ttl=app.config.get("SUMMARY_CACHE_TTL", 86_400)
+    )
+
     @app.route('/api/health', methods=['GET'])
     def health_check():
         """API health check endpoint"""
@@ -46,21 +150,15 @@ def register_routes(app):
             article_data = extract_article(article_url)
             
             # Get the summarizer
-            article_summarizer = get_summarizer()
+            article_summarizer = current_summarizer()
             
-            # Generate summary
-            summary_result = article_summarizer.summarize(article_data)
+            # Generate summary (or reuse the one computed for this article earlier)
+            summary_result = summarize_cached(article_summarizer, article_data)
             
             # Return the result
             return jsonify({
                 'status': 'success',
-                'article': {
-                    'id': article_data.get('id'),
-                    'title': article_data.get('title'),
-                    'authors': article_data.get('authors', []),
-                    'source': article_data.get('source'),
-                    'url': article_url
-                },
+                'article': article_info(article_data, article_url),
                 'summary': summary_result.get('summary', ''),
                 'key_concepts': summary_result.get('key_concepts', [])
             })
@@ -68,6 +166,110 @@ def register_routes(app):
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
+    @app.route('/api/summarize/stream', methods=['POST'])
+    def summarize_stream():
+        """Endpoint to summarize a research article, streaming the summary as Server-Sent Events"""
+        try:
+            data = request.json
+            if not data or 'article_url' not in data:
+                return jsonify({'error': 'Missing article_url in request body'}), 400
+                
+            article_url = data.get('article_url')
+            
+            # Extract article information before starting the stream so errors get a proper status
+            article_data = extract_article(article_url)
+            article_summarizer = current_summarizer()
+            summary_cache = current_summary_cache()
+            
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+        def events():
+            # 'article' first, then 'token' events with pieces of the raw LLM output,
+            # then 'done' with the parsed summary (or 'error')
+            yield sse_event('article', article_info(article_data, article_url))
+            try:
+                key = summary_cache_key(article_data)
+                summary_result = summary_cache.get(key)
+                if summary_result is None:
+                    pieces = []
+                    for piece in article_summarizer.summarize_stream(article_data):
+                        pieces.append(piece)
+                        yield sse_event('token', {'text': piece})
+                    llm_output_text = "".join(pieces)
+                    # Don't cache an empty result so the next request retries the LLM
+                    if not llm_output_text.strip():
+                        yield sse_event('error', {'error': 'Summarization process failed to produce output.'})
+                        return
+                    summary_result = article_summarizer.parse_llm_output(llm_output_text)
+                    summary_cache.set(key, summary_result)
+
+                yield sse_event('done', {
+                    'status': 'success',
+                    'summary': summary_result.get('summary', ''),
+                    'key_concepts': summary_result.get('key_concepts', [])
+                })
+            except Exception as e:
+                yield sse_event('error', {'error': str(e)})
+
+        return Response(events(), mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            # Stop reverse proxies from buffering the stream
+            'X-Accel-Buffering': 'no'
+        })
+
+    @app.route('/api/summarize_batch', methods=['POST'])
+    def summarize_batch():
+        """Endpoint to summarize several research articles in one request"""
+        try:
+            data = request.json
+            article_urls = data.get('article_urls') if data else None
+            if not isinstance(article_urls, list) or not article_urls:
+                return jsonify({'error': 'Missing article_urls list in request body'}), 400
+            if len(article_urls) > MAX_BATCH_SIZE:
+                return jsonify({'error': f'At most {MAX_BATCH_SIZE} article_urls are allowed per request'}), 400
+
+            # Extract article information (one ArXiv API call for all ArXiv URLs)
+            extracted = extract_articles(article_urls)
+
+            # Reuse cached summaries, then summarize the remaining articles concurrently
+            to_summarize = [article for article in extracted if isinstance(article, dict)]
+            summary_cache = current_summary_cache()
+            summaries = [summary_cache.get(summary_cache_key(article_data)) for article_data in to_summarize]
+            missing = [i for i, summary_result in enumerate(summaries) if summary_result is None]
+            if missing:
+                new_summaries = current_summarizer().summarize_batch(
+                    [to_summarize[i] for i in missing],
+                    concurrency=current_app.config.get('SUMMARIZER_BATCH_CONCURRENCY', 8)
+                )
+                for i, summary_result in zip(missing, new_summaries):
+                    summaries[i] = summary_result
+                    # Don't cache failures so the next request retries the LLM
+                    if not summary_result.get('summary', '').startswith('Error:'):
+                        summary_cache.set(summary_cache_key(to_summarize[i]), summary_result)
+            summaries = iter(summaries)
+
+            results = []
+            for article_url, article_data in zip(article_urls, extracted):
+                if not isinstance(article_data, dict):
+                    results.append({'url': article_url, 'error': str(article_data)})
+                    continue
+
+                summary_result = next(summaries)
+                results.append({
+                    'article': article_info(article_data, article_url),
+                    'summary': summary_result.get('summary', ''),
+                    'key_concepts': summary_result.get('key_concepts', [])
+                })
+
+            return jsonify({
+                'status': 'success',
+                'results': results
+            })
+
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
     @app.route('/api/search', methods=['GET'])
     def search():
         """Endpoint to search for articles"""
@@ -1,7 +1,113 @@
+import logging
 import requests
-import xml.etree.ElementTree as ET
+import urllib3
+from lxml import etree as ET
 import re
 
+from app.utils.http import create_session, DEFAULT_TIMEOUT
+
+
+logger = logging.getLogger(__name__)
+
+_SESSION = create_session()
+
+
+# Captures the ID after /abs/ or /pdf/, stopping at '?' or '#' (IDs may contain '/')
+_ARXIV_ID_RE = re.compile(r'/(?:abs|pdf)/([^?#]+)')
+# A whole new-style (YYMM.NNNNN) or old-style (archive/YYMMNNN) ID, with optional version
+_ARXIV_ID_FORMAT_RE = re.compile(r'(?:\d{4}\.\d{4,5}|[a-z][a-z.-]*/\d{7})(?:v\d+)?', re.IGNORECASE)
+
+# Namespaces used in ArXiv Atom feeds
+NS = {
+    'atom': 'http://www.w3.org/2005/Atom',
+    'arxiv': 'http://arxiv.org/schemas/atom',
+    'opensearch': 'http://a9.com/-/spec/opensearch/1.1/'
+}
+ATOM_ENTRY = '{http://www.w3.org/2005/Atom}entry'
+
+# XPath expressions compiled once at import time
+_XP_ENTRIES = ET.XPath('//atom:entry', namespaces=NS)
+_XP_TOTAL_RESULTS = ET.XPath('string(//opensearch:totalResults)', namespaces=NS)
+_XP_TITLE = ET.XPath('string(./atom:title)', namespaces=NS)
+_XP_SUMMARY = ET.XPath('string(./atom:summary)', namespaces=NS)
+
+# Fully-qualified Atom tags, compared against child.tag while walking an entry
+ATOM_ID = '{http://www.w3.org/2005/Atom}id'
+ATOM_TITLE = '{http://www.w3.org/2005/Atom}title'
+ATOM_SUMMARY = '{http://www.w3.org/2005/Atom}summary'
+ATOM_AUTHOR = '{http://www.w3.org/2005/Atom}author'
+ATOM_NAME = '{http://www.w3.org/2005/Atom}name'
+ATOM_PUBLISHED = '{http://www.w3.org/2005/Atom}published'
+ATOM_UPDATED = '{http://www.w3.org/2005/Atom}updated'
+ATOM_LINK = '{http://www.w3.org/2005/Atom}link'
+
+
+def _parse_entry(entry):
+    """
+    Convert an Atom <entry> element into an article dict in a single pass over its children.
+
+    'id' is the versioned ArXiv ID taken from the entry's <id> URL, or None if it
+    could not be extracted; the raw URL is kept under 'id_url'.
+    """
+    id_url, title, abstract, published, updated = '', '', '', '', ''
+    authors = []
+    pdf_url, abs_url = None, None
+
+    for child in entry:
+        tag = child.tag
+        if tag == ATOM_AUTHOR:
+            for author_child in child:
+                if author_child.tag == ATOM_NAME and author_child.text and author_child.text.strip():
+                    authors.append(author_child.text.strip())
+        elif tag == ATOM_LINK:
+            link_rel = child.get('rel')
+            if child.get('title') == 'pdf' and link_rel == 'related':
+                pdf_url = child.get('href')
+            elif link_rel == 'alternate' and child.get('type') == 'text/html':
+                abs_url = child.get('href') # This is usually the link to the abstract page
+        elif tag == ATOM_ID:
+            id_url = (child.text or '').strip()
+        elif tag == ATOM_TITLE:
+            title = (child.text or '').strip()
+        elif tag == ATOM_SUMMARY:
+            abstract = (child.text or '').strip()
+        elif tag == ATOM_PUBLISHED:
+            published = (child.text or '').strip()
+        elif tag == ATOM_UPDATED:
+            updated = (child.text or '').strip()
+
+    return {
+        'id': id_url.split('/abs/')[-1] if '/abs/' in id_url else None,
+        'id_url': id_url,
+        'title': title,
+        'abstract': abstract,
+        'authors': authors,
+        'published': published,
+        'updated': updated,
+        'pdf_url': pdf_url,
+        'abs_url': abs_url,
+        'source': 'arxiv'
+    }
+
+
+def _parse_entries(source):
+    """
+    Parse every <entry> of an Atom feed read from a file-like source into article dicts.
+
+    Entries are parsed incrementally; each one (and the already-processed
+    elements before it) is dropped from the tree once converted, so memory
+    stays flat however many entries the feed holds.
+    """
+    articles = []
+    for _, entry in ET.iterparse(source, tag=ATOM_ENTRY):
+        try:
+            articles.append(_parse_entry(entry))
+        finally:
+            entry.clear()
+            while entry.getprevious() is not None:
+                del entry.getparent()[0]
+    return articles
+
 
 class ArxivExtractor:
     """Class to extract articles from ArXiv API"""
@@ -9,22 +115,16 @@ class ArxivExtractor:
     BASE_URL = "http://export.arxiv.org/api/query"
 
     @staticmethod
-    def extract_from_url(url):
+    def parse_id(url):
         """
-        Extract article content from an ArXiv URL (abs or pdf page).
+        Extract the ArXiv ID from an ArXiv URL (abs or pdf page) without querying the API.
         Handles both new (YYMM.NNNNN) and old (archive/YYMMNNN) ID formats.
         """
         # Regex to find the ID after /abs/ or /pdf/
         # It captures the part after the slash until the end of the path,
         # or before a query parameter '?' or fragment '#'
         # Handles IDs with slashes (like hep-ex/12345) and version numbers (v1, v2)
-        
-        
-        
-        
-        # match = re.search(r'/(?:abs|pdf)/([^/?#]+)', url)
-                # Allow '/' within the ID, stop only at '?' or '#' or end of string
-        match = re.search(r'/(?:abs|pdf)/([^?#]+)', url)
+        match = _ARXIV_ID_RE.search(url)
 
         if not match:
              raise ValueError(f"Could not extract ArXiv ID pattern (e.g., /abs/...) from URL: {url}")
@@ -40,110 +140,96 @@ class ArxivExtractor:
         if not article_id:
              raise ValueError(f"Extracted empty ArXiv ID from URL: {url}")
 
-        print(f"Extracted ArXiv ID: {article_id}")  # Debug log remains useful
+        logger.debug("Extracted ArXiv ID: %s", article_id)
+
+        return article_id
 
-        # No need for the 'abs' or 'pdf' check here anymore if the regex matched
-        # if article_id == 'abs' or article_id == 'pdf':
-        #     raise ValueError(f"Invalid ArXiv ID extracted ('abs' or 'pdf'): {url}")
+    @staticmethod
+    def is_valid_id(article_id):
+        """Check that article_id has the new (YYMM.NNNNN) or old (archive/YYMMNNN) ArXiv ID format"""
+        return _ARXIV_ID_FORMAT_RE.fullmatch(article_id) is not None
 
-        return ArxivExtractor.extract_by_id(article_id)
+    @staticmethod
+    def extract_from_url(url):
+        """
+        Extract article content from an ArXiv URL (abs or pdf page).
+        Handles both new (YYMM.NNNNN) and old (archive/YYMMNNN) ID formats.
+        """
+        return ArxivExtractor.extract_by_id(ArxivExtractor.parse_id(url))
 
     @staticmethod
     def extract_by_id(article_id):
         """Extract article content using its ArXiv ID"""
-        print(f"Querying API with ID: {article_id}") # Add debug log
+        return ArxivExtractor.extract_by_ids([article_id])[0]
+
+    @staticmethod
+    def extract_by_ids(article_ids):
+        """
+        Extract several articles in a single ArXiv API request.
+
+        The API accepts a comma-separated id_list, so N articles cost one HTTP
+        round-trip instead of N. Articles are returned in the order the API
+        lists them, which follows the order of article_ids.
+        """
+        ids_label = ', '.join(article_ids)
+        logger.debug("Querying API with IDs: %s", ids_label)
         params = {
-            'id_list': article_id,
-            'max_results': 1
+            'id_list': ','.join(article_ids),
+            'max_results': len(article_ids)
         }
 
         try:
-            response = requests.get(ArxivExtractor.BASE_URL, params=params)
+            response = _SESSION.get(ArxivExtractor.BASE_URL, params=params, timeout=DEFAULT_TIMEOUT)
             response.raise_for_status() # Raises HTTPError for bad responses (4xx or 5xx)
         except requests.exceptions.RequestException as e:
              # Catch potential network errors or bad HTTP statuses
-             print(f"Error during API request: {e}")
+             logger.error("Error during API request: %s", e)
              # Re-raise or handle as appropriate for your application
              # Returning the original error might be helpful for debugging in the calling code
-             raise ValueError(f"Error fetching data from ArXiv API for ID {article_id}: {e}") from e
+             raise ValueError(f"Error fetching data from ArXiv API for ID {ids_label}: {e}") from e
 
 
         # Parse the XML response
         try:
             root = ET.fromstring(response.content)
         except ET.ParseError as e:
-            print(f"Error parsing XML response: {e}")
-            print(f"Response content: {response.text[:500]}...") # Log part of the response
-            raise ValueError(f"Could not parse ArXiv API response for ID {article_id}") from e
+            logger.error("Error parsing XML response: %s", e)
+            # Only decode part of the body when it is actually logged
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response content: %s...", response.content[:500].decode('utf-8', errors='replace')) # Log part of the response
+            raise ValueError(f"Could not parse ArXiv API response for ID {ids_label}") from e
 
 
         # Extract the article details
-        # Define namespace map INSIDE the function or pass it if needed elsewhere
-        namespace = {'atom': 'http://www.w3.org/2005/Atom', 'arxiv': 'http://arxiv.org/schemas/atom'}
-        entry = root.find('.//atom:entry', namespace)
+        entries = _XP_ENTRIES(root)
 
         # Check for ArXiv API errors embedded in the feed
-        if entry is not None and entry.find('./atom:title', namespace).text == 'Error':
-             error_summary = entry.find('./atom:summary', namespace).text
-             print(f"ArXiv API returned an error for ID {article_id}: {error_summary}")
-             raise ValueError(f"ArXiv API error for ID {article_id}: {error_summary}")
+        if entries and _XP_TITLE(entries[0]).strip() == 'Error':
+             error_summary = _XP_SUMMARY(entries[0]).strip()
+             logger.error("ArXiv API returned an error for ID %s: %s", ids_label, error_summary)
+             raise ValueError(f"ArXiv API error for ID {ids_label}: {error_summary}")
 
-        if entry is None:
+        if not entries:
             # Check if the root itself indicates zero results (though the API usually returns an error entry)
-            opensearch_ns = {'opensearch': 'http://a9.com/-/spec/opensearch/1.1/'}
-            total_results_elem = root.find('.//opensearch:totalResults', {**namespace, **opensearch_ns})
-            if total_results_elem is not None and total_results_elem.text == '0':
-                 raise ValueError(f"Article with ID {article_id} not found (0 results)")
+            if _XP_TOTAL_RESULTS(root) == '0':
+                 raise ValueError(f"Article with ID {ids_label} not found (0 results)")
             else:
                  # General "not found" or unexpected response structure
-                 print(f"Response content (entry not found): {response.text[:500]}...")
-                 raise ValueError(f"Article with ID {article_id} not found or API response structure unexpected.")
-
-
-        # Helper function to safely get text, handling None elements
-        def get_text(element, path, ns):
-            found = element.find(path, ns)
-            return found.text.strip() if found is not None and found.text else ""
-
-        title = get_text(entry, './atom:title', namespace)
-        abstract = get_text(entry, './atom:summary', namespace)
-        # Use a list comprehension with the helper for safety
-        authors = [get_text(author, './atom:name', namespace) for author in entry.findall('./atom:author', namespace)]
-        # Filter out empty author names if any occurred
-        authors = [name for name in authors if name]
-        published = get_text(entry, './atom:published', namespace)
-        updated = get_text(entry, './atom:updated', namespace) # Good to have updated date too
-
-        # Get PDF URL (more robustly)
-        pdf_url = None
-        # Also get the abstract page URL (useful)
-        abs_url = None
-        for link in entry.findall('./atom:link', namespace):
-            link_title = link.get('title')
-            link_rel = link.get('rel')
-            link_href = link.get('href')
-            if link_title == 'pdf' and link_rel == 'related':
-                pdf_url = link_href
-            elif link_rel == 'alternate' and link.get('type') == 'text/html':
-                 abs_url = link_href # This is usually the link to the abstract page
-
-        # Extract the ID *from the API response* as the canonical ID
-        # This handles potential version updates if you didn't specify one
-        canonical_id_url = get_text(entry, './atom:id', namespace)
-        canonical_id = canonical_id_url.split('/abs/')[-1] if '/abs/' in canonical_id_url else article_id
-
-
-        return {
-            'id': canonical_id, # Use the ID confirmed by the API
-            'title': title,
-            'abstract': abstract,
-            'authors': authors,
-            'published': published,
-            'updated': updated,
-            'pdf_url': pdf_url,
-            'abs_url': abs_url, # Add abstract page URL
-            'source': 'arxiv'
-        }
+                 if logger.isEnabledFor(logging.DEBUG):
+                     logger.debug("Response content (entry not found): %s...", response.content[:500].decode('utf-8', errors='replace'))
+                 raise ValueError(f"Article with ID {ids_label} not found or API response structure unexpected.")
+
+
+        articles = []
+        for requested_id, entry in zip(article_ids, entries):
+            article = _parse_entry(entry)
+            # The ID *from the API response* is the canonical ID (it includes the version),
+            # fall back to the requested ID if the entry has none
+            article['id'] = article['id'] or requested_id
+            del article['id_url']
+            articles.append(article)
+
+        return articles
 
     @staticmethod
     def search(query, max_results=10):
@@ -155,74 +241,37 @@ class ArxivExtractor:
             'sortOrder': 'descending' # or 'ascending'
         }
 
-        try:
-            response = requests.get(ArxivExtractor.BASE_URL, params=params)
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-             print(f"Error during API search request: {e}")
-             raise ValueError(f"Error searching ArXiv API for query '{query}': {e}") from e
-
-        # Parse the XML response
-        try:
-            root = ET.fromstring(response.content)
-        except ET.ParseError as e:
-            print(f"Error parsing XML search response: {e}")
-            print(f"Response content: {response.text[:500]}...")
-            raise ValueError(f"Could not parse ArXiv API search response for query '{query}'") from e
+        def check_entry(article):
+             # Check if this entry is an error message
+             if article['title'] == 'Error':
+                 logger.warning("ArXiv API returned an error during search: %s", article['abstract'])
+                 # Decide whether to skip or raise an error - skipping might be okay in search
+                 return None
 
-        # Extract the articles
-        namespace = {'atom': 'http://www.w3.org/2005/Atom', 'arxiv': 'http://arxiv.org/schemas/atom'}
+             if not article['id']:
+                 logger.warning("Could not extract article ID from entry URL: %s", article['id_url'])
+                 return None # Skip entries where ID extraction fails
 
-        # Helper function to safely get text
-        def get_text(element, path, ns):
-            found = element.find(path, ns)
-            return found.text.strip() if found is not None and found.text else ""
+             del article['id_url']
+             return article
 
-        entries = root.findall('.//atom:entry', namespace)
         articles = []
-        for entry in entries:
-             # Check if this entry is an error message
-             if get_text(entry, './atom:title', namespace) == 'Error':
-                 error_summary = get_text(entry, './atom:summary', namespace)
-                 print(f"ArXiv API returned an error during search: {error_summary}")
-                 # Decide whether to skip or raise an error - skipping might be okay in search
-                 continue
-
-             id_url = get_text(entry, './atom:id', namespace)
-             # Extract ID robustly from the ID URL provided in the entry
-             article_id = id_url.split('/abs/')[-1] if '/abs/' in id_url else None
-             if not article_id:
-                 print(f"Warning: Could not extract article ID from entry URL: {id_url}")
-                 continue # Skip entries where ID extraction fails
-
-             title = get_text(entry, './atom:title', namespace)
-             abstract = get_text(entry, './atom:summary', namespace)
-             authors = [get_text(author, './atom:name', namespace) for author in entry.findall('./atom:author', namespace)]
-             authors = [name for name in authors if name] # Filter empty names
-             published = get_text(entry, './atom:published', namespace)
-             updated = get_text(entry, './atom:updated', namespace)
-
-             # Find PDF/alternate links
-             pdf_url, abs_url = None, None
-             for link in entry.findall('./atom:link', namespace):
-                 link_title = link.get('title')
-                 link_rel = link.get('rel')
-                 link_href = link.get('href')
-                 if link_title == 'pdf' and link_rel == 'related':
-                     pdf_url = link_href
-                 elif link_rel == 'alternate' and link.get('type') == 'text/html':
-                     abs_url = link_href
-
-             articles.append({
-                 'id': article_id,
-                 'title': title,
-                 'abstract': abstract,
-                 'authors': authors, # Add authors to search results
-                 'published': published, # Add dates
-                 'updated': updated,
-                 'pdf_url': pdf_url, # Add URLs if available
-                 'abs_url': abs_url,
-                 'source': 'arxiv'
-             })
+        try:
+            with _SESSION.get(ArxivExtractor.BASE_URL, params=params, timeout=DEFAULT_TIMEOUT, stream=True) as response:
+                response.raise_for_status()
+                # Let urllib3 undo any gzip/deflate encoding while lxml reads the raw stream
+                response.raw.decode_content = True
+
+                # Entries are parsed as they arrive from the network
+                for article in _parse_entries(response.raw):
+                    article = check_entry(article)
+                    if article:
+                        articles.append(article)
+        except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+             logger.error("Error during API search request: %s", e)
+             raise ValueError(f"Error searching ArXiv API for query '{query}': {e}") from e
+        except ET.ParseError as e:
+            logger.error("Error parsing XML search response: %s", e)
+            raise ValueError(f"Could not parse ArXiv API search response for query '{query}'") from e
 
         return articles
@@ -1,5 +1,16 @@
-import requests
 import re
+import orjson
+
+from app.utils.http import create_session, DEFAULT_TIMEOUT
+
+
+_SESSION = create_session()
+
+_HAL_ID_RE = re.compile(r'hal-(\d+)')
+
+# Only the fields read by extract_by_id, instead of the full '*' document
+_DOCUMENT_FIELDS = 'docid,title_s,abstract_s,authIdHalFullName_s,publicationDateY_i,files_s'
+
 
 class HalExtractor:
     """Class to extract articles from HAL archives"""
@@ -10,7 +21,7 @@ class HalExtractor:
     def extract_from_url(url):
         """Extract article content from a HAL URL"""
         # Extract the document ID from the URL
-        match = re.search(r'hal-(\d+)', url)
+        match = _HAL_ID_RE.search(url)
         if not match:
             raise ValueError(f"Could not extract HAL ID from URL: {url}")
         
@@ -29,13 +40,13 @@ class HalExtractor:
         # Query the HAL API
         params = {
             'q': f'docid:{hal_id}',
-            'fl': '*',
+            'fl': _DOCUMENT_FIELDS,
             'wt': 'json'
         }
         
-        response = requests.get(HalExtractor.BASE_API_URL, params=params)
+        response = _SESSION.get(HalExtractor.BASE_API_URL, params=params, timeout=DEFAULT_TIMEOUT)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
         if data['response']['numFound'] == 0:
             raise ValueError(f"Article with ID {hal_id} not found")
@@ -83,9 +94,9 @@ class HalExtractor:
             'wt': 'json'
         }
         
-        response = requests.get(HalExtractor.BASE_API_URL, params=params)
+        response = _SESSION.get(HalExtractor.BASE_API_URL, params=params, timeout=DEFAULT_TIMEOUT)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
         articles = []
         for doc in data['response']['docs']:
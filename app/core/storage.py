@@ -1,6 +1,38 @@
 import os
+import time
+import numpy as np
 import pinecone
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Maximum number of vectors sent in a single upsert request
+UPSERT_BATCH_SIZE = 100
+
+# With rerank=True, search fetches this many times top_k candidates before rescoring
+RERANK_CANDIDATES_FACTOR = 4
+
+
+def _meta(article_id, source, title, summary, key_concepts, ts):
+    """Build the metadata stored alongside an article vector (ts is a Unix timestamp in seconds)"""
+    return {
+        'article_id': article_id,
+        'source': source,
+        'title': title,
+        'summary': summary,
+        'key_concepts': list(key_concepts),
+        'timestamp': ts
+    }
+
+
+def _cosine_scores(query_embedding, candidate_embeddings):
+    """Exact cosine similarity between a query and each candidate, computed as one float32 matrix product"""
+    query = np.asarray(query_embedding, dtype=np.float32)
+    candidates = np.asarray(candidate_embeddings, dtype=np.float32)
+    query = query / (np.linalg.norm(query) or 1.0)
+    norms = np.linalg.norm(candidates, axis=1)
+    norms[norms == 0] = 1.0
+    return (candidates @ query) / norms
+
 
 class PineconeStorage:
     """Class to store and retrieve article summaries using Pinecone"""
@@ -39,61 +71,114 @@ class PineconeStorage:
             key_concepts: List of key concepts
             embedding: Vector embedding of the article
         """
-        # Create a unique ID for the record
-        record_id = f"{source}_{article_id}"
-        
-        # Create metadata
-        metadata = {
+        return self.store_summaries([{
             'article_id': article_id,
             'source': source,
             'title': title,
             'summary': summary,
-            'key_concepts': ','.join(key_concepts),
-            'timestamp': datetime.now().isoformat()
-        }
+            'key_concepts': key_concepts,
+            'embedding': embedding
+        }])[0]
+    
+    def store_summaries(self, records):
+        """
+        Store several article summaries, upserting up to UPSERT_BATCH_SIZE vectors per request
         
-        # Upsert the record
+        Args:
+            records: List of dicts with the store_summary arguments as keys
+                     (article_id, source, title, summary, key_concepts, embedding)
+            
+        Returns:
+            List of record IDs, in the same order as records
+        """
+        # One timestamp for the whole batch
+        ts = int(time.time())
+        
+        vectors = []
+        for record in records:
+            # Create a unique ID for the record
+            record_id = f"{record['source']}_{record['article_id']}"
+            metadata = _meta(
+                record['article_id'],
+                record['source'],
+                record['title'],
+                record['summary'],
+                record['key_concepts'],
+                ts
+            )
+            vectors.append((record_id, record['embedding'], metadata))
+        
+        # Upsert the records, the client splits them into batches
         self.index.upsert(
-            vectors=[(record_id, embedding, metadata)]
+            vectors=vectors,
+            batch_size=UPSERT_BATCH_SIZE,
+            show_progress=False
         )
         
-        return record_id
+        return [record_id for record_id, _, _ in vectors]
     
-    def search(self, query_embedding, top_k=5):
+    def search(self, query_embedding, top_k=5, rerank=False):
         """
         Search for similar article summaries
         
         Args:
             query_embedding: Vector embedding of the query
             top_k: Number of results to return
+            rerank: Fetch RERANK_CANDIDATES_FACTOR * top_k approximate candidates with their
+                    vectors and keep the top_k by exact cosine similarity
             
         Returns:
             List of matching articles with their metadata
         """
         results = self.index.query(
             vector=query_embedding,
-            top_k=top_k,
-            include_metadata=True
+            top_k=top_k * RERANK_CANDIDATES_FACTOR if rerank else top_k,
+            include_metadata=True,
+            include_values=rerank
         )
         
+        scored = [(match, match['score']) for match in results['matches']]
+        if rerank and scored:
+            scores = _cosine_scores(query_embedding, [match['values'] for match, _ in scored])
+            scored = [(scored[i][0], float(scores[i])) for i in np.argsort(-scores)[:top_k]]
+        
         matches = []
-        for match in results['matches']:
+        for match, score in scored:
             metadata = match['metadata']
             
-            # Parse key concepts back to a list
-            key_concepts = metadata.get('key_concepts', '').split(',')
-            if len(key_concepts) == 1 and key_concepts[0] == '':
-                key_concepts = []
+            # Key concepts are stored as a list of strings; older records used a comma-joined string
+            key_concepts = metadata.get('key_concepts', [])
+            if isinstance(key_concepts, str):
+                key_concepts = key_concepts.split(',') if key_concepts else []
             
             matches.append({
                 'id': match['id'],
-                'score': match['score'],
+                'score': score,
                 'article_id': metadata.get('article_id'),
                 'source': metadata.get('source'),
                 'title': metadata.get('title'),
                 'summary': metadata.get('summary'),
                 'key_concepts': key_concepts,
+                # Unix timestamp (seconds); older records hold an ISO 8601 string
                 'timestamp': metadata.get('timestamp')
             })
         
-        return matches
\ No newline at end of file
+        return matches
+    
+    def search_batch(self, query_embeddings, top_k=5, max_workers=8):
+        """
+        Run several similarity searches concurrently
+        
+        Args:
+            query_embeddings: List of query vector embeddings
+            top_k: Number of results to return per query
+            max_workers: Maximum number of queries in flight at once
+            
+        Returns:
+            List of match lists, in the same order as query_embeddings
+        """
+        if not query_embeddings:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(query_embeddings))) as executor:
+            return list(executor.map(lambda embedding: self.search(embedding, top_k=top_k), query_embeddings))
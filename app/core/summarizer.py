@@ -1,69 +1,130 @@
 import os
 import re
+import asyncio
+import functools
+import string
+import hashlib
 import logging
-from typing import Dict, Any
+import threading
+import tiktoken
+from typing import Dict, Any, Iterator, List, Optional
 from langchain_groq import ChatGroq
-from langchain_core.prompts import PromptTemplate
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.docstore.document import Document
-from langchain.chains.summarize import load_summarize_chain
+from app.utils.cache import TTLCache, create_cache
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
 
+# tiktoken encoding used to measure text length in tokens
+TOKENIZER_ENCODING = "cl100k_base"
+
+# Context window in tokens of the Groq models, models not listed get DEFAULT_CONTEXT_WINDOW
+MODEL_CONTEXT_WINDOWS = {
+    "llama-3.1-8b-instant": 131_072,
+    "llama-3.3-70b-versatile": 131_072,
+    "meta-llama/llama-4-scout-17b-16e-instruct": 131_072,
+    "meta-llama/llama-4-maverick-17b-128e-instruct": 131_072,
+    "llama3-8b-8192": 8192,
+    "llama3-70b-8192": 8192,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Maximum rounds of re-summarizing map outputs that are too long for the combine call
+MAX_COLLAPSE_ROUNDS = 3
+
+# Output delimiters requested by the combine prompt, matched case-insensitively
+_SUMMARY_ANCHOR = "final summary:"
+_CONCEPTS_ANCHOR = "key concepts:"
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+# A key concept line: "- term", "* term", "• term" or "1. term"
+_BULLET_RE = re.compile(r"^\s*(?:[-*•]|\d+\.)\s*(.*?)\s*$", re.MULTILINE)
 
 
 class LlamaSummarizer:
     """
     Summarizes scientific articles using a Llama model via the Groq API.
 
-    Uses LangChain's map-reduce summarization chain to handle potentially long texts.
+    Uses map-reduce summarization to handle potentially long texts: every chunk is
+    summarized concurrently (map), then the partial summaries are combined in one call.
     Extracts both a structured summary and key concepts.
     """
 
-    def __init__(self, model_name: str = "llama3-8b-8192", temperature: float = 0.2):
+    def __init__(self, model_name: str = "llama-3.1-8b-instant", temperature: float = 0.2, cache_backend: Optional[Any] = None,
+                 max_concurrency: int = 4, combine_model_name: Optional[str] = None):
         """
         Initializes the summarizer.
 
         Args:
-            model_name (str): The name of the Llama model to use on Groq (e.g., "llama3-8b-8192", "llama3-70b-8192").
+            model_name (str): The name of the Llama model to use on Groq (e.g., "llama-3.1-8b-instant", "llama-3.3-70b-versatile").
                                 Check Groq's documentation for available models.
             temperature (float): The sampling temperature for the LLM (0.0 to 1.0). Lower values are more deterministic.
+            cache_backend: Cache for summarization results, any object with get(key) and set(key, value)
+                           (e.g. app.utils.cache.TTLCache or RedisCache). Defaults to an in-memory LRU of 1024 entries.
+            max_concurrency (int): Maximum number of map-step LLM calls in flight at once for one article,
+                                   keeps bursts within the Groq rate limits.
+            combine_model_name (Optional[str]): Model for the single combine call (e.g. a larger "llama-3.3-70b-versatile"
+                                                for a better final summary), defaults to model_name.
 
         Raises:
             ValueError: If the GROQ_API_KEY environment variable is not set.
         """
         api_key = os.environ.get("GROQ_API_KEY")
         if not api_key:
-            logging.error("GROQ_API_KEY environment variable not set.")
+            logger.error("GROQ_API_KEY environment variable not set.")
             raise ValueError("GROQ_API_KEY must be set in environment variables")
 
         self.model_name = model_name
+        self.combine_model_name = combine_model_name or model_name
         self.temperature = temperature
+        self.cache = cache_backend if cache_backend is not None else TTLCache(maxsize=1024, ttl=86_400)
+        self.max_concurrency = max_concurrency
+
+        # Event loop used to run the async API from synchronous callers, see _run
+        self._loop = None
+        self._loop_pid = None
+        self._loop_lock = threading.Lock()
 
+        # Logs every prompt and response, only for debugging
+        verbose = bool(int(os.environ.get("SUMMARIZER_VERBOSE", "0")))
         try:
             self.llm = ChatGroq(
                 api_key=api_key,
                 model=model_name, # Use 'model' parameter for ChatGroq
-                temperature=temperature
+                temperature=temperature,
+                verbose=verbose
+            )
+            # The many map calls use the fast model, the single combine call may use a larger one
+            self.combine_llm = self.llm if self.combine_model_name == model_name else ChatGroq(
+                api_key=api_key,
+                model=self.combine_model_name,
+                temperature=temperature,
+                verbose=verbose
             )
         except Exception as e:
-            logging.error(f"Failed to initialize ChatGroq LLM: {e}")
+            logger.error("Failed to initialize ChatGroq LLM: %s", e)
             raise
 
         # --- Prompts for Summarization Chain ---
+        # The static instructions go first, in the system message, and the article text comes last.
+        # Every call then starts with the same token prefix, which lets the provider's prompt cache
+        # reuse it instead of reprocessing the instructions for each chunk and article.
 
         # Map Prompt: Summarize individual chunks concisely
         self.map_prompt_template = """
-        Based *only* on the following text snippet from a scientific article, write a very concise summary focusing on the key information presented:
-        "{text}"
-        CONCISE SUMMARY:
+        Based *only* on the text snippet from a scientific article given by the user, write a very concise summary focusing on the key information presented.
+        Reply with the concise summary only.
         """
-        self.map_prompt = PromptTemplate.from_template(self.map_prompt_template)
+        self.map_prompt = ChatPromptTemplate.from_messages([
+            ("system", self.map_prompt_template),
+            ("human", "{text}"),
+        ])
 
         # Combine Prompt: Synthesize map results into a final structured summary + key concepts
         self.combine_prompt_template = """
         Your task is to synthesize intermediate summaries of a scientific article for a student audience.
+        The intermediate summaries are given by the user and are your only source material.
         Create a comprehensive final summary structured in approximately 5 short paragraphs, clearly highlighting:
         1. The main research question or problem addressed.
         2. The core methodology or approach used by the researchers.
@@ -73,9 +134,6 @@ class LlamaSummarizer:
 
         After the summary, provide a list of 5-7 essential key concepts or technical terms crucial for understanding the research.
 
-        Use the following intermediate summaries as your source material:
-        "{text}"
-
         Provide your output in the following format EXACTLY:
         FINAL SUMMARY:
         [Your comprehensive summary paragraphs here]
@@ -85,27 +143,77 @@ class LlamaSummarizer:
         - Concept 2
         - ...
         """
-        self.combine_prompt = PromptTemplate.from_template(self.combine_prompt_template)
+        self.combine_prompt = ChatPromptTemplate.from_messages([
+            ("system", self.combine_prompt_template),
+            ("human", "Intermediate summaries:\n{text}"),
+        ])
+
+        # --- Chains ---
+        # Prompt -> LLM -> text; map chunks go through map_chain.abatch, which runs them concurrently
+        self.map_chain = self.map_prompt | self.llm | StrOutputParser()
+        self.combine_chain = self.combine_prompt | self.combine_llm | StrOutputParser()
+
+        # --- Token budget ---
+        self.context_window = MODEL_CONTEXT_WINDOWS.get(model_name, DEFAULT_CONTEXT_WINDOW)
+        self.combine_context_window = MODEL_CONTEXT_WINDOWS.get(self.combine_model_name, DEFAULT_CONTEXT_WINDOW)
+        self.max_output_tokens = 1024  # Room kept for the generated summary and key concepts
+
+        # tiktoken encoding, loaded on first use, see _get_encoding
+        self._encoding = None
+        self._encoding_loaded = False
+        self._encoding_lock = threading.Lock()
+
+    def _get_encoding(self) -> Optional[Any]:
+        """
+        Returns the tiktoken encoding, or None if it cannot be loaded.
 
-        # --- Summarization Chain Setup ---
-        try:
-            self.chain = load_summarize_chain(
-                self.llm,
-                chain_type="map_reduce",
-                map_prompt=self.map_prompt,
-                combine_prompt=self.combine_prompt,
-                verbose=True # Set to False in production if logs are too noisy
-            )
-        except Exception as e:
-            logging.error(f"Failed to load summarization chain: {e}")
-            raise
+        tiktoken downloads the encoding file the first time it is used (unless it is already in
+        TIKTOKEN_CACHE_DIR), so it is loaded lazily: the app still starts on hosts without access
+        to the download, and token counts fall back to an estimate.
+        """
+        if not self._encoding_loaded:
+            with self._encoding_lock:
+                if not self._encoding_loaded:
+                    try:
+                        self._encoding = tiktoken.get_encoding(TOKENIZER_ENCODING)
+                    except Exception as e:
+                        logger.warning("Could not load the %s tokenizer, estimating token counts: %s", TOKENIZER_ENCODING, e)
+                    self._encoding_loaded = True
+        return self._encoding
+
+    def _count_tokens(self, text: str) -> int:
+        """Approximate number of tokens in text for the Llama models."""
+        encoding = self._get_encoding()
+        if encoding is None:
+            # Roughly 4 characters per token for English text
+            return len(text) // 4
+        # Special-token strings in article text are counted as plain text instead of raising
+        return len(encoding.encode(text, disallowed_special=()))
+
+    @functools.cached_property
+    def prompt_overhead(self) -> int:
+        """Tokens taken by the combine prompt around the text (plus chat message framing)."""
+        return self._count_tokens(self.combine_prompt_template) + 32
+
+    @functools.cached_property
+    def map_input_tokens(self) -> int:
+        """Maximum tokens of text sent in one map call."""
+        map_prompt_overhead = self._count_tokens(self.map_prompt_template) + 32
+        return self.context_window - self.max_output_tokens - map_prompt_overhead
+
+    @functools.cached_property
+    def text_splitter(self) -> RecursiveCharacterTextSplitter:
+        """
+        Splitter for the map step, created on first use since it needs the tokenizer.
 
-        # --- Text Splitter ---
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=4000,  # Adjust based on model context window and typical article length
+        Chunks are measured in tokens so each one packs close to the map model's context window.
+        cl100k_base is an approximation of the Llama tokenizer, hence the headroom left for the
+        prompt and the generated summary.
+        """
+        return RecursiveCharacterTextSplitter(
+            chunk_size=self.map_input_tokens,
             chunk_overlap=200,
-            length_function=len,
-            add_start_index=True # Helpful for context if needed later
+            length_function=self._count_tokens
         )
 
     def _prepare_input_text(self, article_data: Dict[str, Any]) -> str:
@@ -118,49 +226,153 @@ class LlamaSummarizer:
         if article_data.get('abstract'):
             text_parts.append(f"Abstract: {article_data['abstract']}")
         else:
-             logging.warning("No abstract found in article data. Summary quality may be reduced.")
+             logger.warning("No abstract found in article data. Summary quality may be reduced.")
 
         # Use full text if provided, otherwise summary relies heavily on abstract/title
         full_text = article_data.get('full_text')
-        if full_text:
-            text_parts.append(f"Full Text:\n{full_text}")
-            logging.info("Using full text for summarization.")
-        else:
-            logging.info("Full text not provided. Summarizing based on Title and Abstract.")
-
-        return "\n\n".join(text_parts)
-
-    def _parse_llm_output(self, llm_output: str) -> Dict[str, Any]:
+        if not full_text:
+            logger.info("Full text not provided. Summarizing based on Title and Abstract.")
+            return "\n\n".join(text_parts)
+
+        logger.info("Using full text for summarization.")
+        # Joined in one step so the (possibly multi-megabyte) full text is copied only once,
+        # into the result, instead of first into a "Full Text:" part and then into the join
+        header = "\n\n".join(text_parts)
+        return "".join((header, "\n\n" if header else "", "Full Text:\n", full_text))
+
+    def _cache_key(self, input_text: str) -> str:
+        """Cache key for a prepared input text, also covering the model settings that affect the output."""
+        text_hash = hashlib.sha256(input_text.encode('utf-8')).hexdigest()
+        return f"summary:{self.model_name}:{self.combine_model_name}:{self.temperature}:{text_hash}"
+
+    def _chunk_cache_key(self, chunk: str) -> str:
+        """Cache key for the map-step summary of one chunk."""
+        chunk_hash = hashlib.blake2b(chunk.encode('utf-8'), digest_size=16).hexdigest()
+        return f"chunk:{self.model_name}:{self.temperature}:{chunk_hash}"
+
+    def parse_llm_output(self, llm_output: str) -> Dict[str, Any]:
         """Parses the structured output from the LLM."""
         summary = llm_output # Default if parsing fails
         key_concepts = []
 
         try:
-            # Use regex to split based on the expected format, ignoring case
-            # Looks for "FINAL SUMMARY:" and "KEY CONCEPTS:" as delimiters
-            summary_match = re.search(r"FINAL SUMMARY:(.*?)KEY CONCEPTS:", llm_output, re.IGNORECASE | re.DOTALL)
-            concepts_match = re.search(r"KEY CONCEPTS:(.*)", llm_output, re.IGNORECASE | re.DOTALL)
+            # Locate the fixed "FINAL SUMMARY:" and "KEY CONCEPTS:" delimiters, ignoring case.
+            # Only ASCII letters are lowered so indices in the lowered copy match llm_output.
+            lowered = llm_output.translate(_ASCII_LOWER)
+            summary_start = lowered.find(_SUMMARY_ANCHOR)
+            concepts_start = lowered.find(_CONCEPTS_ANCHOR, summary_start + len(_SUMMARY_ANCHOR)) if summary_start >= 0 else -1
 
-            if summary_match and concepts_match:
-                summary = summary_match.group(1).strip()
-                concepts_text = concepts_match.group(1).strip()
+            if concepts_start >= 0:
+                summary = llm_output[summary_start + len(_SUMMARY_ANCHOR):concepts_start].strip()
+                concepts_text = llm_output[concepts_start + len(_CONCEPTS_ANCHOR):].strip()
 
                 # Extract concepts (handles lines starting with -, *, or number.)
-                raw_concepts = re.findall(r"^\s*(?:[-*•]|\d+\.)\s*(.*?)\s*$", concepts_text, re.MULTILINE)
+                raw_concepts = _BULLET_RE.findall(concepts_text)
                 key_concepts = [concept.strip() for concept in raw_concepts if concept.strip()]
             else:
-                logging.warning("Could not parse LLM output using expected delimiters ('FINAL SUMMARY:', 'KEY CONCEPTS:'). Returning full output as summary.")
+                logger.warning("Could not parse LLM output using expected delimiters ('FINAL SUMMARY:', 'KEY CONCEPTS:'). Returning full output as summary.")
                 # Attempt simpler split as fallback? Maybe not reliable enough.
                 # Keep key_concepts empty if primary parsing failed.
 
         except Exception as e:
-            logging.error(f"Error parsing LLM output: {e}. Returning raw output.")
+            logger.error("Error parsing LLM output: %s. Returning raw output.", e)
             summary = llm_output # Ensure we still return the raw output on error
             key_concepts = []
 
         return {'summary': summary, 'key_concepts': key_concepts}
 
 
+    def _run(self, coro):
+        """
+        Runs a coroutine on the summarizer's event loop and waits for its result.
+
+        The async Groq client keeps its pooled connections bound to the loop they were
+        opened on, so all calls go through one long-lived loop running in a background
+        thread instead of a new asyncio.run() loop per call. The loop is (re)started
+        lazily in each process, so it also works in forked server workers.
+        """
+        with self._loop_lock:
+            if self._loop is None or self._loop_pid != os.getpid():
+                self._loop = asyncio.new_event_loop()
+                self._loop_pid = os.getpid()
+                threading.Thread(target=self._loop.run_forever, name="summarizer-loop", daemon=True).start()
+            loop = self._loop
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    async def _map_async(self, texts: List[str]) -> List[str]:
+        """Summarizes each chunk concurrently, at most max_concurrency LLM calls at a time, reusing cached chunk summaries."""
+        # Chunks are cached individually, so a revised article only re-summarizes the chunks that changed
+        cache_keys = [self._chunk_cache_key(text) for text in texts]
+        summaries = [self.cache.get(cache_key) for cache_key in cache_keys]
+        missing = [i for i, summary in enumerate(summaries) if summary is None]
+
+        if missing:
+            new_summaries = await self.map_chain.abatch(
+                [{"text": texts[i]} for i in missing],
+                config={"max_concurrency": self.max_concurrency}
+            )
+            for i, summary in zip(missing, new_summaries):
+                summaries[i] = summary
+                self.cache.set(cache_keys[i], summary)
+
+        return summaries
+
+    async def _map_step_async(self, input_text: str) -> List[str]:
+        """
+        Returns the texts to feed to the combine prompt.
+
+        Input that fits in the context window together with the combine prompt and its output
+        is passed through unchanged, which saves the map call(s). Longer input is split into
+        chunks that are summarized concurrently, then collapsed if needed (see _collapse_async).
+        """
+        if self._count_tokens(input_text) + self.prompt_overhead <= self.combine_context_window - self.max_output_tokens:
+            logger.info("Input fits in the context window, summarizing in a single call.")
+            return [input_text]
+
+        # Split text into chunks for the map step
+        texts = self.text_splitter.split_text(input_text)
+        # Repeated boilerplate (headers, affiliations) can produce identical chunks, summarize each only once
+        texts = list(dict.fromkeys(texts))
+
+        logger.info("Summarizing using %d document chunks.", len(texts))
+
+        return await self._collapse_async(await self._map_async(texts))
+
+    async def _collapse_async(self, partial_summaries: List[str]) -> List[str]:
+        """
+        Re-summarizes the map-step summaries until they fit in the combine call.
+
+        Many chunks, or a combine model with a smaller context than the map model, can give
+        partial summaries that together overflow the combine prompt. They are then grouped into
+        map-sized inputs and summarized again through the map chain.
+        """
+        budget = self.combine_context_window - self.prompt_overhead - self.max_output_tokens
+
+        for _ in range(MAX_COLLAPSE_ROUNDS):
+            if len(partial_summaries) < 2 or self._count_tokens(self._combine_input(partial_summaries)["text"]) <= budget:
+                return partial_summaries
+
+            groups, group, group_tokens = [], [], 0
+            for summary in partial_summaries:
+                tokens = self._count_tokens(summary)
+                if group and group_tokens + tokens > self.map_input_tokens:
+                    groups.append(group)
+                    group, group_tokens = [], 0
+                group.append(summary)
+                group_tokens += tokens
+            groups.append(group)
+
+            logger.info("Collapsing %d partial summaries into %d.", len(partial_summaries), len(groups))
+            partial_summaries = await self._map_async(["\n\n".join(group) for group in groups])
+
+        if self._count_tokens(self._combine_input(partial_summaries)["text"]) > budget:
+            logger.warning("Partial summaries still exceed the combine context window after %d collapse rounds.", MAX_COLLAPSE_ROUNDS)
+        return partial_summaries
+
+    def _combine_input(self, partial_summaries: List[str]) -> Dict[str, str]:
+        """Builds the combine chain input from the map-step summaries."""
+        return {"text": "\n\n".join(partial_summaries)}
+
     def summarize(self, article_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Summarizes the provided article data.
@@ -176,36 +388,155 @@ class LlamaSummarizer:
                             Returns empty concepts list and potentially raw LLM output
                             as summary if parsing fails.
         """
+        return self._run(self.summarize_async(article_data))
+
+    async def summarize_async(self, article_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Asynchronous version of summarize, the map-step LLM calls for all chunks run concurrently.
+
+        Args:
+            article_data (Dict[str, Any]): Same as for summarize.
+
+        Returns:
+            Dict[str, Any]: Same as for summarize.
+        """
         if not article_data or not article_data.get('abstract'):
-             logging.warning("Summarizer called with missing or empty article data/abstract.")
+             logger.warning("Summarizer called with missing or empty article data/abstract.")
              return {'summary': "Error: Insufficient article data provided for summarization.", 'key_concepts': []}
 
         input_text = self._prepare_input_text(article_data)
 
         if not input_text.strip():
-            logging.warning("Prepared input text is empty.")
+            logger.warning("Prepared input text is empty.")
             return {'summary': "Error: No text content available for summarization.", 'key_concepts': []}
 
-        # Split text into documents for the map-reduce chain
-        texts = self.text_splitter.split_text(input_text)
-        docs = [Document(page_content=t) for t in texts]
-
-        logging.info(f"Summarizing using {len(docs)} document chunks.")
+        # Identical input with the same model settings gives an equivalent summary, skip the LLM
+        cache_key = self._cache_key(input_text)
+        cached_output = self.cache.get(cache_key)
+        if cached_output is not None:
+            logger.info("Returning cached summary.")
+            return cached_output
 
         try:
-            # Run the summarization chain
-            result = self.chain.invoke({"input_documents": docs})
-            llm_output_text = result.get("output_text", "")
+            # Map (unless the text fits in one call), then combine the partial summaries in one call
+            partial_summaries = await self._map_step_async(input_text)
+            llm_output_text = await self.combine_chain.ainvoke(self._combine_input(partial_summaries))
 
             if not llm_output_text:
-                logging.error("Summarization chain returned empty output.")
+                logger.error("Summarization chain returned empty output.")
                 return {'summary': "Error: Summarization process failed to produce output.", 'key_concepts': []}
 
             # Parse the structured output
-            parsed_output = self._parse_llm_output(llm_output_text)
+            parsed_output = self.parse_llm_output(llm_output_text)
+            self.cache.set(cache_key, parsed_output)
             return parsed_output
 
         except Exception as e:
-            logging.error(f"Error during summarization chain execution: {e}", exc_info=True) # Log traceback
+            logger.error("Error during summarization chain execution: %s", e, exc_info=True) # Log traceback
             return {'summary': f"Error: Summarization failed due to an internal error ({type(e).__name__}).", 'key_concepts': []}
 
+    def summarize_batch(self, articles: List[Dict[str, Any]], concurrency: int = 8) -> List[Dict[str, Any]]:
+        """
+        Summarizes several articles concurrently.
+
+        Args:
+            articles (List[Dict[str, Any]]): Article data dictionaries, as for summarize.
+            concurrency (int): Maximum number of articles summarized at once.
+
+        Returns:
+            List[Dict[str, Any]]: One result per article, in the same order, as returned by summarize.
+        """
+        return self._run(self.summarize_batch_async(articles, concurrency=concurrency))
+
+    async def summarize_batch_async(self, articles: List[Dict[str, Any]], concurrency: int = 8) -> List[Dict[str, Any]]:
+        """
+        Asynchronous version of summarize_batch.
+
+        Each article still limits its own map step to max_concurrency calls, so up to
+        concurrency * max_concurrency LLM calls can be in flight.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def summarize_one(article_data: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.summarize_async(article_data)
+
+        return await asyncio.gather(*(summarize_one(article_data) for article_data in articles))
+
+    def summarize_stream(self, article_data: Dict[str, Any]) -> Iterator[str]:
+        """
+        Summarizes the provided article data, yielding the final output as it is generated.
+
+        The map step runs as in summarize; only the combine call is streamed, so text starts
+        arriving as soon as the model produces its first tokens instead of after the whole
+        summary. The concatenated pieces are the raw LLM output, in the format expected by
+        parse_llm_output.
+
+        Args:
+            article_data (Dict[str, Any]): Same as for summarize.
+
+        Yields:
+            str: Successive pieces of the raw LLM output.
+
+        Raises:
+            ValueError: If there is no abstract or no text to summarize.
+        """
+        if not article_data or not article_data.get('abstract'):
+            logger.warning("Summarizer called with missing or empty article data/abstract.")
+            raise ValueError("Insufficient article data provided for summarization.")
+
+        input_text = self._prepare_input_text(article_data)
+
+        if not input_text.strip():
+            logger.warning("Prepared input text is empty.")
+            raise ValueError("No text content available for summarization.")
+
+        cache_key = self._cache_key(input_text)
+        cached_output = self.cache.get(cache_key)
+        if cached_output is not None:
+            # Replay the cached result in the format requested by the combine prompt
+            logger.info("Returning cached summary.")
+            concepts = "\n".join(f"- {concept}" for concept in cached_output['key_concepts'])
+            yield f"FINAL SUMMARY:\n{cached_output['summary']}\n\nKEY CONCEPTS:\n{concepts}"
+            return
+
+        partial_summaries = self._run(self._map_step_async(input_text))
+
+        pieces = []
+        for chunk in self.combine_chain.stream(self._combine_input(partial_summaries)):
+            if chunk:
+                pieces.append(chunk)
+                yield chunk
+
+        llm_output_text = "".join(pieces)
+        if llm_output_text:
+            self.cache.set(cache_key, self.parse_llm_output(llm_output_text))
+
+
+@functools.lru_cache(maxsize=1)
+def get_summarizer(model_name: str, temperature: float = 0.2, max_concurrency: int = 4,
+                   cache_redis_url: Optional[str] = None, cache_maxsize: int = 1024,
+                   cache_ttl: int = 86_400, combine_model_name: Optional[str] = None) -> LlamaSummarizer:
+    """
+    Returns the process-wide summarizer, creating it on first use.
+
+    Calls with the same settings share one instance (LLM clients, prompts, tokenizer and
+    result cache). Under `gunicorn --preload` the instance built while importing the app is
+    inherited by every forked worker.
+
+    Args:
+        model_name (str): Groq model name.
+        temperature (float): Sampling temperature.
+        max_concurrency (int): Maximum concurrent map-step LLM calls per article.
+        cache_redis_url (Optional[str]): Redis URL for the result cache, in-memory cache if None.
+        cache_maxsize (int): Maximum entries of the in-memory result cache.
+        cache_ttl (int): Lifetime of cached results in seconds.
+        combine_model_name (Optional[str]): Groq model name for the combine call, model_name if None.
+    """
+    return LlamaSummarizer(
+        model_name=model_name,
+        temperature=temperature,
+        cache_backend=create_cache(redis_url=cache_redis_url, maxsize=cache_maxsize, ttl=cache_ttl),
+        max_concurrency=max_concurrency,
+        combine_model_name=combine_model_name
+    )
@@ -0,0 +1,106 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import orjson
+
+
+logger = logging.getLogger(__name__)
+
+class TTLCache:
+    """
+    Thread-safe in-memory LRU cache whose entries expire after a fixed time-to-live.
+
+    Used to keep results of expensive calls (article summarization) so that
+    repeated requests for the same article skip the LLM entirely.
+    """
+
+    def __init__(self, maxsize=1024, ttl=86_400):
+        """
+        Args:
+            maxsize: Maximum number of entries kept; the least recently used is evicted first
+            ttl: Lifetime of an entry in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key, or None if it is missing or expired"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """Store value under key, evicting the least recently used entry if full"""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class RedisCache:
+    """
+    Cache stored in Redis, so entries are shared by all worker processes.
+
+    Values must be JSON-serializable. Exposes the same get/set interface as TTLCache.
+    Redis errors are logged and treated as cache misses, so an outage only costs the cache.
+    """
+
+    def __init__(self, url, ttl=86_400, prefix='research-assistant:'):
+        """
+        Args:
+            url: Redis connection URL, e.g. redis://localhost:6379/0
+            ttl: Lifetime of an entry in seconds
+            prefix: Prefix added to every key to namespace this application's entries
+        """
+        # Optional dependency, only needed when a Redis URL is configured
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self._errors = redis.RedisError
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        """Return the cached value for key, or None if it is missing or expired"""
+        try:
+            value = self._client.get(self.prefix + key)
+        except self._errors as e:
+            logger.warning("Redis cache get failed, treating as a miss: %s", e)
+            return None
+        return orjson.loads(value) if value is not None else None
+
+    def set(self, key, value):
+        """Store value under key with the configured time-to-live"""
+        try:
+            self._client.setex(self.prefix + key, self.ttl, orjson.dumps(value))
+        except self._errors as e:
+            logger.warning("Redis cache set failed, value not cached: %s", e)
+
+
+def create_cache(redis_url=None, maxsize=1024, ttl=86_400, prefix='research-assistant:'):
+    """Return a RedisCache if redis_url is set, otherwise an in-process TTLCache"""
+    if redis_url:
+        return RedisCache(redis_url, ttl=ttl, prefix=prefix)
+    return TTLCache(maxsize=maxsize, ttl=ttl)
@@ -1,28 +1,59 @@
 import re
 
+
+# New style (YYMM.NNNNN) or old style (archive/YYMMNNN) ArXiv ID
+_ARXIV_PATTERN = r'\d{4}\.\d{4,5}|[a-z][a-z.-]*\/\d{7}'
+_ARXIV_RE = re.compile(_ARXIV_PATTERN, re.IGNORECASE)
+_HAL_RE = re.compile(r'hal-(\d+)')
+# Both ID formats in one pattern, for extract_id
+_COMBINED_RE = re.compile(rf'hal-(?P<hal>\d+)|(?P<arxiv>{_ARXIV_PATTERN})', re.IGNORECASE)
+
+
+# (substring, source) pairs checked in order; the first match wins
+_SOURCES = (
+    ('arxiv.org', 'arxiv'),
+    ('hal.archives-ouvertes.fr', 'hal'),
+    ('hal-', 'hal')
+)
+
+
 def detect_source_from_url(url):
     """Detect the source of an article from its URL"""
-    if 'arxiv.org' in url:
-        return 'arxiv'
-    elif 'hal.archives-ouvertes.fr' in url or 'hal-' in url:
-        return 'hal'
-    else:
-        return None
+    return next((source for needle, source in _SOURCES if needle in url), None)
 
 def extract_arxiv_id(url):
     """Extract ArXiv ID from URL"""
-    match = re.search(r'(\d+\.\d+|[a-z]+\/\d+)', url)
+    match = _ARXIV_RE.search(url)
     if match:
         return match.group(0)
     return None
 
 def extract_hal_id(url):
     """Extract HAL ID from URL"""
-    match = re.search(r'hal-(\d+)', url)
+    match = _HAL_RE.search(url)
     if match:
         return match.group(0)
     return None
 
+def extract_id(url):
+    """
+    Extract the source and article ID from a URL in a single pass.
+
+    Returns a (source, id) tuple, or (None, None) if no ID is found.
+    """
+    # Plain new-style abs URLs (arxiv.org/abs/2101.00001) need no regex
+    if 'arxiv.org/abs/' in url:
+        tail = url.rsplit('/', 1)[-1]
+        if '.' in tail and tail.replace('.', '', 1).isdigit():
+            return 'arxiv', tail
+
+    match = _COMBINED_RE.search(url)
+    if not match:
+        return None, None
+    if match['hal']:
+        return 'hal', match.group(0)
+    return 'arxiv', match['arxiv']
+
 def format_authors(authors_list):
     """Format a list of authors into a readable string"""
     if not authors_list:
@@ -0,0 +1,36 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+
+# (connect, read) timeouts in seconds for calls to external APIs
+DEFAULT_TIMEOUT = (3, 15)
+
+USER_AGENT = 'research-assistant/0.1.0'
+
+
+def create_session(pool_maxsize=32):
+    """
+    Create a requests Session with keep-alive connection pooling and retries.
+
+    Sessions are safe to share between threads for concurrent GET requests,
+    so extractors keep one per module and reuse its TCP/TLS connections.
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=frozenset(['GET'])
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=retry)
+
+    session = requests.Session()
+    # urllib3 advertises only the encodings it can decode ('br' once brotli is installed)
+    session.headers.update({
+        'Accept-Encoding': ACCEPT_ENCODING,
+        'User-Agent': USER_AGENT
+    })
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
@@ -12,5 +12,21 @@ PINECONE_ENVIRONMENT = os.environ.get("PINECONE_ENVIRONMENT")
 PINECONE_INDEX_NAME = "research-summaries"
 
 # Summarization settings
-LLAMA_MODEL = "meta-llama/llama-4-scout-17b-16e-instruct"
-MAX_SUMMARY_LENGTH = 500
\ No newline at end of file
+LLAMA_MODEL = "llama-3.1-8b-instant"
+# Optional larger model for the final combine call, e.g. llama-3.3-70b-versatile
+LLAMA_COMBINE_MODEL = os.environ.get("LLAMA_COMBINE_MODEL")
+MAX_SUMMARY_LENGTH = 500
+# Maximum concurrent map-step LLM calls per article (keep within the Groq rate limits)
+SUMMARIZER_MAX_CONCURRENCY = 4
+# Maximum articles summarized at once by /api/summarize_batch
+SUMMARIZER_BATCH_CONCURRENCY = 8
+
+# Summary cache settings (entries keyed by source and canonical article ID)
+SUMMARY_CACHE_MAXSIZE = 10_000
+SUMMARY_CACHE_TTL = 86_400  # seconds
+
+# LLM result cache, keyed by a hash of the summarizer input
+LLM_CACHE_MAXSIZE = 1024
+
+# Share both caches between worker processes through Redis (e.g. redis://localhost:6379/0)
+CACHE_REDIS_URL = os.environ.get("CACHE_REDIS_URL")
@@ -1,15 +1,54 @@
 import os
+import logging.config
 from dotenv import load_dotenv
 from app import create_app
 
 load_dotenv()
 
+# Configured once here rather than in library modules, which only create their loggers
+logging.config.dictConfig({
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'default': {'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s'}
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'default'}
+    },
+    # LangChain and the HTTP client behind the Groq SDK log every call at INFO
+    'loggers': {
+        'langchain': {'level': 'WARNING'},
+        'httpx': {'level': 'WARNING'}
+    },
+    'root': {
+        'level': os.environ.get('LOG_LEVEL', 'INFO').upper(),
+        'handlers': ['console']
+    }
+})
+
+# Built at import time (summarizer included) so that `gunicorn --preload main:app`
+# initializes it once and forked workers share it copy-on-write
 app = create_app()
 
 
 def main():
+    port = os.environ.get("PORT", "5000")
+
+    if os.environ.get("FLASK_ENV") == "production":
+        # Requests spend most of their time waiting on ArXiv/HAL and Groq, so threaded
+        # gunicorn workers overlap them. Up to workers x threads x SUMMARIZER_MAX_CONCURRENCY
+        # LLM calls can be in flight: lower GUNICORN_THREADS if Groq rate limits are hit.
+        workers = os.environ.get("WEB_CONCURRENCY", str(os.cpu_count() or 1))
+        threads = os.environ.get("GUNICORN_THREADS", "16")
+        os.execvp("gunicorn", [
+            "gunicorn", "--preload",
+            "-w", workers, "-k", "gthread", "--threads", threads,
+            "-b", f"0.0.0.0:{port}",
+            "main:app"
+        ])
+
     debug = os.environ.get("FLASK_DEBUG", "False").lower() == "true"
-    app.run(debug=debug, host="0.0.0.0", port=int(os.environ.get("PORT", 5000)))
+    app.run(debug=debug, host="0.0.0.0", port=int(port))
 
 
 if __name__ == "__main__":